@@ -69,6 +69,17 @@ def render_message(role: str, timestamp: str, content_html: str) -> str:
 </div>
 """
 
+def render_continuation(session_id: str, count: int, href: str) -> str:
+    noun = "message" if count == 1 else "messages"
+    target = f'<a href="{html.escape(href)}">{html.escape(session_id)}</a>'
+
+    return f"""
+<details class="continuation">
+    <summary>Continued from session {html.escape(session_id)} ({count} earlier {noun})</summary>
+    <div class="message-content">These messages are rendered once, in the transcript of session {target}.</div>
+</details>
+"""
+
 def format_gemini_html(session_data: Dict[str, Any], title: str = None) -> str:
     session_id = session_data.get('sessionId', 'Unknown')
     start_time = session_data.get('startTime', '')
@@ -107,16 +118,41 @@ def format_gemini_html(session_data: Dict[str, Any], title: str = None) -> str:
         content="".join(messages_html)
     )
 
-def format_claude_html(session_id: str, messages: List[Dict[str, Any]], title: str = None) -> str:
-    start_time = "Unknown"
-    if messages:
-        start_time = messages[0].get('timestamp', '')
-    
+def format_claude_html(
+    session_id: str,
+    messages: List[Dict[str, Any]],
+    title: str = None,
+    continuations: List[Dict[str, Any]] = None,
+    links: Dict[str, str] = None
+) -> str:
     display_title = title if title else f"Claude Session {session_id}"
+    links = links or {}
+    
+    # History replayed from earlier sessions is collapsed into a link when that
+    # session is exported alongside; otherwise it is rendered inline as usual.
+    segment_starts = {}
+    collapsed = set()
+    offset = 0
+    for segment in continuations or []:
+        href = links.get(segment['id'])
+        if href:
+            segment_starts[offset] = render_continuation(segment['id'], segment['count'], href)
+            collapsed.update(range(offset, offset + segment['count']))
+        offset += segment['count']
+    
+    # Date the session by its own first message, not by replayed history
+    start_time = "Unknown"
+    shown = [msg for idx, msg in enumerate(messages) if idx not in collapsed]
+    if shown:
+        start_time = shown[0].get('timestamp', '')
     
     messages_html = []
     
-    for msg in messages:
+    for idx, msg in enumerate(messages):
+        if idx in segment_starts:
+            messages_html.append(segment_starts[idx])
+        if idx in collapsed:
+            continue
         role = msg.get('type', 'unknown')
         timestamp = msg.get('timestamp', '')
         message_data = msg.get('message', {})
@@ -1,13 +1,16 @@
 import typer
 import json
 import re
+import time
 from pathlib import Path
 from rich.console import Console
 from rich.progress import track
+from rich.table import Table
 from .parsers import TranscriptParser
 from .html_formatter import format_gemini_html, format_claude_html
 from .formatter import format_timestamp, extract_title
 from .ai import generate_title
+from .stats import UsageCache, compute_stats, session_duration_summary
 
 app = typer.Typer(help="Tool to save Gemini and Claude transcripts to HTML.")
 console = Console()
@@ -113,41 +116,66 @@ def main(
     output_dir.mkdir(parents=True, exist_ok=True)
     console.print(f"Saving [bold]{len(selected_transcripts)}[/bold] transcripts to [bold]{output_dir}[/bold]...")
 
-    for transcript in track(selected_transcripts, description="Processing & Generating Titles..."):
+    # Replayed history is only collapsed against sessions exported in this run,
+    # so every continuation link points at a file written alongside it.
+    continuations = parser.find_shared_prefixes(
+        [t for t in selected_transcripts if t['source'] == 'claude']
+    )
+
+    # First pass: titles and filenames, so continuation links can point at siblings
+    planned = []
+    used_filenames = set()
+    for transcript in track(selected_transcripts, description="Generating Titles..."):
         try:
             # Prepare content for title generation
             raw_text = ""
             if transcript['source'] == 'gemini':
                 raw_text = json.dumps(transcript['data'].get('messages', []), indent=2)
             elif transcript['source'] == 'claude':
-                raw_text = json.dumps(transcript.get('messages', []), indent=2)
+                # Title a resumed session by its own messages, not the replayed history
+                shared = sum(seg['count'] for seg in continuations.get(transcript['id'], []))
+                raw_text = json.dumps(transcript.get('messages', [])[shared:], indent=2)
+            else:
+                continue
 
             # Generate Title using Gemini API
             ai_title = generate_title(raw_text)
             
-            # Formatter and Filename Logic
-            content = ""
-            filename = ""
-            
             if transcript['source'] == 'gemini':
                 session_id = transcript['data'].get('sessionId')
-                content = format_gemini_html(transcript['data'], title=ai_title)
-                
-                if ai_title:
-                     filename = f"{sanitize_filename(ai_title)}.html"
-                else:
-                     filename = f"gemini-{session_id}.html"
-
-            elif transcript['source'] == 'claude':
+            else:
                 session_id = transcript['id']
-                content = format_claude_html(session_id, transcript['messages'], title=ai_title)
-                
-                if ai_title:
-                     filename = f"{sanitize_filename(ai_title)}.html"
-                else:
-                     filename = f"claude-{session_id}.html"
+
+            if ai_title:
+                 filename = f"{sanitize_filename(ai_title)}.html"
             else:
-                continue
+                 filename = f"{transcript['source']}-{session_id}.html"
+
+            # Never let two exports share a file, or links could point at an overwritten one
+            if filename in used_filenames:
+                 filename = f"{filename[:-len('.html')]} {session_id}.html"
+            used_filenames.add(filename)
+
+            planned.append((transcript, ai_title, filename))
+            
+        except Exception as e:
+            console.print(f"[red]Failed to generate title or filename for {transcript.get('path')}: {e}[/red]")
+
+    claude_links = {t['id']: filename for t, _, filename in planned if t['source'] == 'claude'}
+
+    # Second pass: render and write
+    for transcript, ai_title, filename in track(planned, description="Rendering..."):
+        try:
+            if transcript['source'] == 'gemini':
+                content = format_gemini_html(transcript['data'], title=ai_title)
+            else:
+                content = format_claude_html(
+                    transcript['id'],
+                    transcript['messages'],
+                    title=ai_title,
+                    continuations=continuations.get(transcript['id']),
+                    links=claude_links
+                )
 
             output_path = output_dir / filename
             output_path.write_text(content, encoding='utf-8')
@@ -157,5 +185,82 @@ def main(
 
     console.print("[green]Done![/green]")
 
+def _token_table(title: str, label: str, rows) -> Table:
+    table = Table(title=title)
+    table.add_column(label)
+    for column in ("Input", "Output", "Cache Write", "Cache Read", "Total"):
+        table.add_column(column, justify="right")
+    for key, totals in rows:
+        table.add_row(key, *(f"{n:,}" for n in totals), f"{sum(totals):,}")
+    return table
+
+def _format_duration(seconds: float) -> str:
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes:02d}m" if hours else f"{minutes}m {secs:02d}s"
+
+@app.command()
+def stats(
+    days: int = typer.Option(
+        14,
+        "--days", "-d",
+        help="Number of most recent days to show in the per-day table."
+    ),
+    rebuild: bool = typer.Option(
+        False,
+        "--rebuild",
+        help="Discard the usage cache and rescan every Claude session."
+    )
+):
+    """
+    Show token usage, tool call and session statistics across all Claude Code sessions.
+    """
+    started = time.perf_counter()
+
+    cache = UsageCache()
+    if not rebuild:
+        cache.load()
+
+    with console.status("[bold green]Updating usage cache..."):
+        changed = cache.refresh()
+        if changed or rebuild:
+            cache.save()
+
+    if not cache.chunks:
+        console.print("[yellow]No Claude sessions found.[/yellow]")
+        return
+
+    results = compute_stats(list(cache.chunks.values()))
+    elapsed = time.perf_counter() - started
+
+    by_day = list(results['by_day'].items())[-days:] if days > 0 else []
+    console.print(_token_table("Tokens per Day (UTC)", "Day", by_day))
+    console.print(_token_table(
+        "Tokens per Project", "Project",
+        sorted(results['by_project'].items(), key=lambda kv: sum(kv[1]), reverse=True)
+    ))
+    console.print(_token_table(
+        "Tokens per Model", "Model",
+        sorted(results['by_model'].items(), key=lambda kv: sum(kv[1]), reverse=True)
+    ))
+
+    tool_table = Table(title="Tool Calls")
+    tool_table.add_column("Tool")
+    tool_table.add_column("Calls", justify="right")
+    tool_table.add_column("Errors", justify="right")
+    tool_table.add_column("Error Rate", justify="right")
+    for name, (calls, errors) in sorted(results['tools'].items(), key=lambda kv: kv[1][0], reverse=True):
+        tool_table.add_row(name, f"{calls:,}", f"{errors:,}", f"{errors / calls:.1%}")
+    console.print(tool_table)
+
+    count, total, mean, median = session_duration_summary(results['durations'])
+    console.print(
+        f"[bold]Sessions:[/bold] {count:,}  "
+        f"[bold]Total:[/bold] {_format_duration(total)}  "
+        f"[bold]Mean:[/bold] {_format_duration(mean)}  "
+        f"[bold]Median:[/bold] {_format_duration(median)}"
+    )
+    console.print(f"[dim]{changed} session files rescanned or removed; computed in {elapsed:.2f}s.[/dim]")
+
 if __name__ == "__main__":
     app()
\ No newline at end of file
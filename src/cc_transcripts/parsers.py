@@ -1,6 +1,7 @@
 import json
 import os
 import glob
+import hashlib
 from pathlib import Path
 from typing import List, Dict, Any, Generator
 
@@ -71,6 +72,57 @@ class TranscriptParser:
             except Exception as e:
                 print(f"Error parsing Claude file {file_path}: {e}")
 
+    @staticmethod
+    def _message_key(entry: Dict[str, Any]) -> str:
+        """Identify a Claude entry by its uuid, falling back to a content hash."""
+        if entry.get('uuid'):
+            return entry['uuid']
+        payload = json.dumps(
+            [entry.get('type'), entry.get('timestamp'), entry.get('message')],
+            sort_keys=True, ensure_ascii=False, default=str
+        )
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+    def find_shared_prefixes(self, transcripts: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+        """Find history replayed by resumed sessions among the given Claude transcripts.
+
+        Sessions are visited oldest first. Returns, per session id, the leading
+        messages already owned by an earlier session as segments of
+        {'id', 'count'}, one per originating session. Transcripts are not modified.
+        """
+        prefixes: Dict[str, List[Dict[str, Any]]] = {}
+        owners: Dict[str, str] = {}
+        # Replays keep their original timestamps, so break ties on the last message
+        ordered = sorted(transcripts, key=lambda t: (
+            t['messages'][0].get('timestamp', '') or '',
+            t['messages'][-1].get('timestamp', '') or '',
+            len(t['messages'])
+        ))
+
+        for transcript in ordered:
+            keys = [self._message_key(m) for m in transcript['messages']]
+
+            segments = []
+            shared = 0
+            while shared < len(keys) and keys[shared] in owners:
+                owner = owners[keys[shared]]
+                if segments and segments[-1]['id'] == owner:
+                    segments[-1]['count'] += 1
+                else:
+                    segments.append({'id': owner, 'count': 1})
+                shared += 1
+
+            # Keep sessions that are a pure replay intact rather than emptying them
+            if shared == len(keys):
+                segments, shared = [], 0
+
+            for key in keys[shared:]:
+                owners.setdefault(key, transcript['id'])
+
+            prefixes[transcript['id']] = segments
+
+        return prefixes
+
     def get_all_transcripts(self, source: str = 'all') -> Generator[Dict[str, Any], None, None]:
         if source in ['all', 'gemini']:
             yield from self.get_gemini_transcripts()
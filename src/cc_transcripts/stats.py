@@ -0,0 +1,313 @@
+import glob
+import hashlib
+import json
+import math
+import os
+import pickle
+from array import array
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+CACHE_VERSION = 3
+
+# Token counters carried in Claude's message.usage, in column order
+TOKEN_FIELDS = (
+    'input_tokens',
+    'output_tokens',
+    'cache_creation_input_tokens',
+    'cache_read_input_tokens',
+)
+
+# Per-row columns built while scanning a file, with their array typecodes
+ENTRY_COLUMNS = {'entry_key': 'q', 'entry_time': 'd'}
+MSG_COLUMNS = {'msg_key': 'q', 'msg_time': 'd', 'msg_model': 'H', **{f: 'q' for f in TOKEN_FIELDS}}
+TOOL_COLUMNS = {'tool_key': 'q', 'tool_name': 'H', 'tool_error': 'b'}
+
+# Only the id keys outlive a scan; they let later files drop replayed rows
+KEY_COLUMNS = ('entry_key', 'msg_key', 'tool_key')
+
+# Key stored for rows without an id; these are never deduplicated
+NO_KEY = 0
+
+def parse_timestamp(ts_str: str) -> Optional[float]:
+    try:
+        return datetime.fromisoformat(ts_str.replace('Z', '+00:00')).timestamp()
+    except (ValueError, TypeError, AttributeError):
+        return None
+
+def _key(value: str) -> int:
+    """Hash an id string to a signed 64-bit key for compact storage."""
+    digest = hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little', signed=True) or 1
+
+def _intern(table: Dict[str, int], names: List[str], value: str) -> int:
+    if value not in table:
+        table[value] = len(names)
+        names.append(value)
+    return table[value]
+
+def scan_session(file_path: str, project: str) -> Dict[str, Any]:
+    """Read one Claude JSONL session into per-row typed arrays.
+
+    Strings are interned per file (models, tool names) and ids are hashed to
+    64-bit keys. Rows are only deduplicated within the file here; see
+    UsageCache.refresh.
+    """
+    stat = os.stat(file_path)
+    chunk = {
+        'mtime': stat.st_mtime,
+        'size': stat.st_size,
+        'project': project,
+        'session': Path(file_path).stem,
+        'models': [],
+        'tool_names': [],
+    }
+    for column, typecode in {**ENTRY_COLUMNS, **MSG_COLUMNS, **TOOL_COLUMNS}.items():
+        chunk[column] = array(typecode)
+
+    model_table: Dict[str, int] = {}
+    tool_table: Dict[str, int] = {}
+    tool_rows: Dict[str, int] = {}
+    seen_msgs = set()
+
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip(): continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if entry.get('type') not in ['user', 'assistant']:
+                continue
+
+            # Every prompt, response and tool result marks session activity
+            ts = parse_timestamp(entry.get('timestamp', ''))
+            chunk['entry_key'].append(_key(entry['uuid']) if entry.get('uuid') else NO_KEY)
+            chunk['entry_time'].append(ts if ts is not None else math.nan)
+
+            message = entry.get('message')
+            if not isinstance(message, dict):
+                continue
+            content = message.get('content')
+            blocks = content if isinstance(content, list) else []
+
+            if entry['type'] == 'assistant':
+                # A streamed response is split across entries sharing one message id
+                # and one usage block; count it once.
+                msg_id = message.get('id') or entry.get('uuid')
+                usage = message.get('usage')
+                if msg_id and isinstance(usage, dict) and msg_id not in seen_msgs:
+                    seen_msgs.add(msg_id)
+                    chunk['msg_key'].append(_key(msg_id))
+                    chunk['msg_time'].append(ts if ts is not None else math.nan)
+                    chunk['msg_model'].append(
+                        _intern(model_table, chunk['models'], message.get('model') or 'unknown')
+                    )
+                    for field in TOKEN_FIELDS:
+                        chunk[field].append(int(usage.get(field) or 0))
+
+                for block in blocks:
+                    if isinstance(block, dict) and block.get('type') == 'tool_use':
+                        tool_id = block.get('id')
+                        if tool_id:
+                            if tool_id in tool_rows:
+                                continue
+                            tool_rows[tool_id] = len(chunk['tool_key'])
+                        chunk['tool_key'].append(_key(tool_id) if tool_id else NO_KEY)
+                        chunk['tool_name'].append(
+                            _intern(tool_table, chunk['tool_names'], block.get('name') or 'unknown')
+                        )
+                        chunk['tool_error'].append(0)
+            else:
+                for block in blocks:
+                    if isinstance(block, dict) and block.get('type') == 'tool_result':
+                        row = tool_rows.get(block.get('tool_use_id') or '')
+                        if row is not None and block.get('is_error'):
+                            chunk['tool_error'][row] = 1
+
+    return chunk
+
+def _time_span(times: array) -> Tuple[Optional[float], Optional[float]]:
+    valid = [t for t in times if not math.isnan(t)]
+    return (min(valid), max(valid)) if valid else (None, None)
+
+def _keep_rows(chunk: Dict[str, Any], columns: Dict[str, str], keep: List[int]) -> None:
+    for column, typecode in columns.items():
+        values = chunk[column]
+        chunk[column] = array(typecode, (values[i] for i in keep))
+
+def _drop_seen(chunk: Dict[str, Any], seen: set) -> None:
+    """Remove rows already owned by an earlier session, then summarize the rest.
+
+    The session span is taken from the surviving entries only, so a resumed
+    session does not inherit the duration of the history it replays. Afterwards
+    only the id keys and the summaries are kept on the chunk.
+    """
+    for key_column, columns in (
+        ('entry_key', ENTRY_COLUMNS),
+        ('msg_key', MSG_COLUMNS),
+        ('tool_key', TOOL_COLUMNS),
+    ):
+        keep = [i for i, key in enumerate(chunk[key_column]) if key == NO_KEY or key not in seen]
+        if len(keep) < len(chunk[key_column]):
+            _keep_rows(chunk, columns, keep)
+        seen.update(chunk[key_column])
+    seen.discard(NO_KEY)
+
+    chunk['start'], chunk['end'] = _time_span(chunk['entry_time'])
+
+    # Pre-aggregate per (day, model) and per tool so queries only merge summaries.
+    # Rows without a timestamp get a day of None.
+    usage = defaultdict(lambda: [0] * len(TOKEN_FIELDS))
+    columns = [chunk[field] for field in TOKEN_FIELDS]
+    for row, (ts, model) in enumerate(zip(chunk['msg_time'], chunk['msg_model'])):
+        day = None if math.isnan(ts) else int(ts // 86400)
+        totals = usage[(day, chunk['models'][model])]
+        for i, column in enumerate(columns):
+            totals[i] += column[row]
+    chunk['usage'] = dict(usage)
+
+    tools = defaultdict(lambda: [0, 0])
+    for name_idx, is_error in zip(chunk['tool_name'], chunk['tool_error']):
+        counts = tools[chunk['tool_names'][name_idx]]
+        counts[0] += 1
+        counts[1] += is_error
+    chunk['tools'] = dict(tools)
+
+    for column in {**ENTRY_COLUMNS, **MSG_COLUMNS, **TOOL_COLUMNS}:
+        if column not in KEY_COLUMNS:
+            del chunk[column]
+    del chunk['models'], chunk['tool_names']
+
+def _scan_order(chunk: Dict[str, Any]) -> Tuple[float, float, int]:
+    # Replays keep their original timestamps, so break ties on the last row
+    start, end = _time_span(chunk['entry_time'])
+    return (start if start is not None else math.inf, end if end is not None else math.inf, len(chunk['entry_key']))
+
+class UsageCache:
+    """Per-session usage summaries, persisted and refreshed incrementally.
+
+    Session files are re-read only when their size or mtime changes. Each
+    cached session holds its token totals per (day, model), tool call and
+    error counts, its start/end times, and the 64-bit id keys of the rows it
+    owns. History replayed by resumed sessions is dropped at refresh time
+    against those keys, so each row is counted exactly once.
+    """
+
+    def __init__(self, cache_path: Path = None, home: Path = None):
+        self.home = home or Path.home()
+        self.cache_path = cache_path or self.home / ".cache" / "cc-transcripts" / "usage.pickle"
+        self.chunks: Dict[str, Dict[str, Any]] = {}
+
+    def load(self) -> None:
+        try:
+            with open(self.cache_path, 'rb') as f:
+                data = pickle.load(f)
+            if isinstance(data, dict) and data.get('version') == CACHE_VERSION:
+                self.chunks = data['chunks']
+        except Exception:
+            # Missing, stale or corrupt caches are simply rebuilt
+            self.chunks = {}
+
+    def save(self) -> None:
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_suffix('.tmp')
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({'version': CACHE_VERSION, 'chunks': self.chunks}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.cache_path)
+
+    def refresh(self) -> int:
+        """Rescan new or modified session files. Returns the number of files changed."""
+        claude_projects = self.home / ".claude" / "projects"
+        pattern = str(claude_projects / "*" / "*.jsonl")
+
+        stats = {}
+        for file_path in glob.glob(pattern):
+            if "agent-" in Path(file_path).name:
+                continue
+            try:
+                stats[file_path] = os.stat(file_path)
+            except OSError as e:
+                print(f"Error scanning Claude file {file_path}: {e}")
+
+        # A deleted session may own history that others replayed, so start over
+        removed = len(self.chunks.keys() - stats.keys())
+        if removed:
+            self.chunks = {}
+
+        current = {}
+        for file_path, stat in stats.items():
+            cached = self.chunks.get(file_path)
+            if cached and cached['mtime'] == stat.st_mtime and cached['size'] == stat.st_size:
+                current[file_path] = cached
+
+        scanned = []
+        for file_path in stats.keys() - current.keys():
+            try:
+                scanned.append((file_path, scan_session(file_path, Path(file_path).parent.name)))
+            except Exception as e:
+                print(f"Error scanning Claude file {file_path}: {e}")
+
+        if scanned:
+            seen = set()
+            for chunk in current.values():
+                for column in KEY_COLUMNS:
+                    seen.update(chunk[column])
+            seen.discard(NO_KEY)
+
+            # Oldest first, so replayed rows stay with the session that produced them
+            for file_path, chunk in sorted(scanned, key=lambda item: _scan_order(item[1])):
+                _drop_seen(chunk, seen)
+                current[file_path] = chunk
+
+        self.chunks = current
+        return len(scanned) + removed
+
+def _day_label(day: int) -> str:
+    return datetime.fromtimestamp(day * 86400, tz=timezone.utc).strftime('%Y-%m-%d')
+
+def compute_stats(chunks: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge the per-session summaries built at refresh time into overall totals."""
+    zero = lambda: [0] * len(TOKEN_FIELDS)
+    by_day = defaultdict(zero)
+    by_project = defaultdict(zero)
+    by_model = defaultdict(zero)
+    tool_calls = defaultdict(lambda: [0, 0])
+    durations = []
+
+    for chunk in chunks:
+        if chunk['start'] is not None:
+            durations.append(chunk['end'] - chunk['start'])
+
+        for (day, model), totals in chunk['usage'].items():
+            targets = [by_project[chunk['project']], by_model[model]]
+            if day is not None:
+                targets.append(by_day[day])
+            for target in targets:
+                for i, value in enumerate(totals):
+                    target[i] += value
+
+        for name, (calls, errors) in chunk['tools'].items():
+            counts = tool_calls[name]
+            counts[0] += calls
+            counts[1] += errors
+
+    return {
+        'by_day': {_day_label(day): by_day[day] for day in sorted(by_day)},
+        'by_project': {k: v for k, v in by_project.items() if any(v)},
+        'by_model': dict(by_model),
+        'tools': {k: tuple(v) for k, v in tool_calls.items()},
+        'durations': sorted(durations),
+    }
+
+def session_duration_summary(durations: List[float]) -> Tuple[int, float, float, float]:
+    """Return (count, total, mean, median) session durations in seconds."""
+    if not durations:
+        return 0, 0.0, 0.0, 0.0
+    count = len(durations)
+    total = sum(durations)
+    mid = count // 2
+    median = durations[mid] if count % 2 else (durations[mid - 1] + durations[mid]) / 2
+    return count, total, total / count, median